@@ -5,6 +5,8 @@ Based on Google's A2A protocol concepts for inter-agent communication
 
 import asyncio
 import json
+import mmap
+import os
 import time
 from dataclasses import dataclass, asdict
 from typing import Dict, List, Any, Optional, Callable
@@ -33,25 +35,251 @@ class A2AHeader:
     requires_ack: bool = False
     correlation_id: Optional[str] = None
 
+BLOB_HANDLE_KEY = "$blob"
+BLOB_HANDLE_FIELDS = {BLOB_HANDLE_KEY, "size", "content_type"}
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
+class BlobStore:
+    """Local store for large payload bodies that agents pass by reference.
+
+    Python objects are kept as-is, so an in-process hand-off never encodes or
+    copies them. Binary data is kept as a memoryview and files are
+    memory-mapped instead of read into memory.
+
+    The store owns every blob until it is released. Blobs attached with
+    A2AProtocol.create_message belong to the sending agent, which releases
+    them when the receiver acknowledges the message.
+    """
+
+    def __init__(self):
+        self._blobs: Dict[str, Any] = {}
+        self._mmaps: Dict[str, mmap.mmap] = {}
+        self._paths: Dict[str, str] = {}
+
+    def put(self, data: Any, content_type: Optional[str] = None) -> 'BlobRef':
+        """Store a value and return a reference to it.
+
+        bytes and memoryview values are wrapped without copying. A bytearray
+        is copied once so the caller stays free to resize or reuse it.
+        """
+        if isinstance(data, BINARY_TYPES):
+            if isinstance(data, bytearray):
+                data = bytes(data)
+            blob = memoryview(data)
+            return self._register(blob, blob.nbytes, content_type or "application/octet-stream")
+        return self._register(data, None, content_type or "application/json")
+
+    def put_file(self, path: str, content_type: str = "application/octet-stream",
+                 blob_id: Optional[str] = None) -> 'BlobRef':
+        """Memory-map a file read-only and return a reference to its contents.
+
+        The handle of a file blob carries its path, so an agent in another
+        process can map the same file instead of receiving a copy.
+        """
+        path = os.path.abspath(path)
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap refuses empty files
+                mapped = None
+                blob = memoryview(b"")
+            else:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                blob = memoryview(mapped)
+        ref = self._register(blob, blob.nbytes, content_type, blob_id)
+        ref.path = path
+        if mapped is not None:
+            self._mmaps[ref.blob_id] = mapped
+        self._paths[ref.blob_id] = path
+        return ref
+
+    def get(self, blob_id: str) -> Any:
+        """Return a blob's value; binary blobs come back as a fresh memoryview slice"""
+        if blob_id not in self._blobs:
+            raise KeyError(f"Unknown blob: {blob_id}")
+        blob = self._blobs[blob_id]
+        if isinstance(blob, memoryview):
+            # A slice outlives release() of the stored view
+            return blob[:]
+        return blob
+
+    def release(self, blob_id: str):
+        """Drop a blob once no agent needs it any more.
+
+        Slices already handed out stay valid. A memory-mapped file that still
+        has live slices is closed when the last of them is garbage collected.
+        """
+        self._paths.pop(blob_id, None)
+        blob = self._blobs.pop(blob_id, None)
+        if isinstance(blob, memoryview):
+            blob.release()
+        mapped = self._mmaps.pop(blob_id, None)
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+
+    def __contains__(self, blob_id: str) -> bool:
+        return blob_id in self._blobs
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def path_of(self, blob_id: str) -> Optional[str]:
+        """Return the file backing a blob, if it was added with put_file"""
+        return self._paths.get(blob_id)
+
+    def _register(self, blob: Any, size: Optional[int], content_type: str,
+                  blob_id: Optional[str] = None) -> 'BlobRef':
+        blob_id = blob_id or str(uuid.uuid4())
+        self._blobs[blob_id] = blob
+        return BlobRef(blob_id, size, content_type, store=self)
+
+# Agents living in the same process share this store unless given their own
+default_blob_store = BlobStore()
+
+class BlobRef:
+    """Reference to a blob held in a BlobStore.
+
+    Deliberately not a dataclass: dataclasses.asdict() deep-copies dataclass
+    fields, which would drag the whole store along with the reference.
+    """
+
+    def __init__(self, blob_id: str, size: Optional[int], content_type: str,
+                 store: Optional[BlobStore] = None, path: Optional[str] = None):
+        self.blob_id = blob_id
+        self.size = size
+        self.content_type = content_type
+        self.store = store if store is not None else default_blob_store
+        # Set for file blobs, which any process can map from the same path
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"BlobRef(blob_id={self.blob_id!r}, size={self.size!r}, content_type={self.content_type!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BlobRef) and other.blob_id == self.blob_id
+
+    def __hash__(self) -> int:
+        return hash(self.blob_id)
+
+    def __copy__(self) -> 'BlobRef':
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'BlobRef':
+        return self
+
+    @property
+    def is_binary(self) -> bool:
+        # Only binary blobs have a byte size; object blobs are kept as-is
+        return self.size is not None
+
+    def value(self) -> Any:
+        """Return the referenced value without copying it.
+
+        A file blob received from another process is mapped into the local
+        store on first access.
+        """
+        if self.path is not None and self.blob_id not in self.store:
+            self.store.put_file(self.path, self.content_type, blob_id=self.blob_id)
+        return self.store.get(self.blob_id)
+
+    def release(self):
+        self.store.release(self.blob_id)
+
+    def to_handle(self) -> Dict[str, Any]:
+        """Serializable stand-in used when a message is encoded"""
+        handle = {
+            BLOB_HANDLE_KEY: self.blob_id,
+            "size": self.size,
+            "content_type": self.content_type
+        }
+        if self.path is not None:
+            handle["path"] = self.path
+        return handle
+
+    @classmethod
+    def from_handle(cls, handle: Dict[str, Any], store: Optional[BlobStore] = None) -> 'BlobRef':
+        return cls(
+            blob_id=handle[BLOB_HANDLE_KEY],
+            size=handle["size"],
+            content_type=handle["content_type"],
+            store=store,
+            path=handle.get("path")
+        )
+
+    @staticmethod
+    def is_handle(value: Any) -> bool:
+        """Match only the exact shape produced by to_handle, not any dict with a "$blob" key"""
+        if not isinstance(value, dict):
+            return False
+        keys = set(value)
+        if keys != BLOB_HANDLE_FIELDS and keys != BLOB_HANDLE_FIELDS | {"path"}:
+            return False
+        return (
+            isinstance(value[BLOB_HANDLE_KEY], str)
+            and (value["size"] is None or isinstance(value["size"], int))
+            and isinstance(value["content_type"], str)
+            and isinstance(value.get("path", ""), str)
+        )
+
 @dataclass
 class A2APayload:
     action: str
     data: Dict[str, Any]
     metadata: Optional[Dict[str, Any]] = None
 
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a data field, resolving it first if it is carried by reference"""
+        value = self.data.get(key, default)
+        if isinstance(value, BlobRef):
+            return value.value()
+        return value
+
+    def blob_refs(self) -> List[BlobRef]:
+        return [value for value in self.data.values() if isinstance(value, BlobRef)]
+
+    def to_dict(self, inline_blobs: bool = False) -> Dict[str, Any]:
+        """Encode without deep-copying data.
+
+        Blobs are replaced by their handles, which only resolve inside this
+        process unless they point at a file. Pass ``inline_blobs=True`` when the
+        message leaves the process: object blobs are embedded by value, file
+        blobs keep their path handle, and in-memory binary blobs raise since
+        no other process could resolve them.
+        """
+        data = {}
+        for key, value in self.data.items():
+            if isinstance(value, BlobRef):
+                if not inline_blobs or value.path is not None:
+                    value = value.to_handle()
+                elif value.is_binary:
+                    raise ValueError(
+                        f"Binary blob '{key}' only exists in this process; "
+                        "add it with BlobStore.put_file to send it elsewhere"
+                    )
+                else:
+                    value = value.value()
+            data[key] = value
+        return {
+            "action": self.action,
+            "data": data,
+            "metadata": self.metadata
+        }
+
 @dataclass
 class A2AMessage:
     header: A2AHeader
     payload: A2APayload
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, inline_blobs: bool = False) -> Dict[str, Any]:
         return {
             "header": asdict(self.header),
-            "payload": asdict(self.payload)
+            "payload": self.payload.to_dict(inline_blobs)
         }
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'A2AMessage':
+    def from_dict(cls, data: Dict[str, Any], blob_store: Optional[BlobStore] = None) -> 'A2AMessage':
         header_data = data["header"]
         header = A2AHeader(
             version=header_data["version"],
@@ -67,15 +295,19 @@ class A2AMessage:
         payload_data = data["payload"]
         payload = A2APayload(
             action=payload_data["action"],
-            data=payload_data["data"],
+            data={
+                key: BlobRef.from_handle(value, blob_store) if BlobRef.is_handle(value) else value
+                for key, value in payload_data["data"].items()
+            },
             metadata=payload_data.get("metadata")
         )
         
         return cls(header=header, payload=payload)
 
 class A2AProtocol:
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, blob_store: Optional[BlobStore] = None):
         self.agent_id = agent_id
+        self.blob_store = blob_store if blob_store is not None else default_blob_store
         self.message_handlers: Dict[str, Callable] = {}
         self.pending_acks: Dict[str, A2AMessage] = {}
         self.message_history: List[A2AMessage] = []
@@ -92,8 +324,21 @@ class A2AProtocol:
                       data: Dict[str, Any],
                       priority: MessagePriority = MessagePriority.NORMAL,
                       requires_ack: bool = False,
-                      correlation_id: Optional[str] = None) -> A2AMessage:
-        """Create a new A2A message"""
+                      correlation_id: Optional[str] = None,
+                      blobs: Optional[Dict[str, Any]] = None) -> A2AMessage:
+        """Create a new A2A message
+
+        Values in ``blobs`` are placed in the blob store and carried in
+        ``data`` by reference, so large results are never copied or
+        re-encoded on their way between agents. A message carrying blobs
+        always requires an ACK: the sender keeps the blobs alive for
+        redelivery and releases them in acknowledge().
+        """
+        if blobs:
+            requires_ack = True
+            data = dict(data)
+            for key, value in blobs.items():
+                data[key] = value if isinstance(value, BlobRef) else self.blob_store.put(value)
         
         header = A2AHeader(
             version=ProtocolVersion.V2_0.value,
@@ -181,6 +426,15 @@ class A2AProtocol:
         else:
             print(f"   ⚠️  No handler registered for action: {action}")
             
+    def acknowledge(self, message_id: str) -> bool:
+        """Settle a pending message once its ACK arrives and release its blobs"""
+        message = self.pending_acks.pop(message_id, None)
+        if message is None:
+            return False
+        for blob in message.payload.blob_refs():
+            blob.release()
+        return True
+        
     def get_capabilities(self) -> List[str]:
         """Get the capabilities of this agent"""
         return list(self.message_handlers.keys())
@@ -191,16 +445,19 @@ class A2AProtocol:
             "total_messages": len(self.message_history),
             "pending_acks": len(self.pending_acks),
             "registered_handlers": len(self.message_handlers),
-            "connected_agents": len(self.connected_agents)
+            "connected_agents": len(self.connected_agents),
+            "stored_blobs": len(self.blob_store)
         }
 
 class MultimediaAgent:
-    def __init__(self, agent_id: str, agent_type: str, capabilities: List[str]):
+    def __init__(self, agent_id: str, agent_type: str, capabilities: List[str],
+                 blob_store: Optional[BlobStore] = None):
         self.agent_id = agent_id
         self.agent_type = agent_type
         self.capabilities = capabilities
-        self.protocol = A2AProtocol(agent_id)
+        self.protocol = A2AProtocol(agent_id, blob_store=blob_store)
         self.current_jobs: Dict[str, Dict[str, Any]] = {}
+        self.received_results: Dict[str, Dict[str, Any]] = {}
         
         # Register default handlers
         self.setup_handlers()
@@ -208,6 +465,7 @@ class MultimediaAgent:
     def setup_handlers(self):
         """Setup message handlers for this agent"""
         self.protocol.register_handler("process", self.handle_process_request)
+        self.protocol.register_handler("process_complete", self.handle_process_complete)
         self.protocol.register_handler("status", self.handle_status_request)
         self.protocol.register_handler("cancel", self.handle_cancel_request)
         self.protocol.register_handler("ack", self.handle_acknowledgment)
@@ -216,7 +474,7 @@ class MultimediaAgent:
     async def handle_process_request(self, message: A2AMessage):
         """Handle a processing request"""
         job_data = message.payload.data
-        job_id = job_data.get("job_id")
+        job_id = message.payload.get("job_id")
         
         print(f"[{self.agent_id}] Starting processing for job: {job_id}")
         
@@ -224,16 +482,15 @@ class MultimediaAgent:
         self.current_jobs[job_id] = {
             "status": "processing",
             "start_time": time.time(),
-            "file_path": job_data.get("file_path"),
+            "file_path": message.payload.get("file_path"),
             "requester": message.header.from_agent
         }
         
         # Simulate processing based on agent type
         results = await self.simulate_processing(job_data)
         
-        # Update job status
+        # Update job status; results are handed to the requester, not kept here
         self.current_jobs[job_id]["status"] = "completed"
-        self.current_jobs[job_id]["results"] = results
         self.current_jobs[job_id]["end_time"] = time.time()
         
         # Send completion response
@@ -242,13 +499,21 @@ class MultimediaAgent:
             action="process_complete",
             data={
                 "job_id": job_id,
-                "status": "completed",
-                "results": results
+                "status": "completed"
             },
-            correlation_id=message.header.message_id
+            correlation_id=message.header.message_id,
+            blobs={"results": results}
         )
         
         await self.protocol.send_message(response)
+        return response
+        
+    async def handle_process_complete(self, message: A2AMessage):
+        """Handle results sent back by an agent that finished a job"""
+        job_id = message.payload.get("job_id")
+        results = message.payload.get("results") or {}
+        self.received_results.setdefault(job_id, {})[message.header.from_agent] = results
+        print(f"[{self.agent_id}] Received {len(results)} results from {message.header.from_agent} for job: {job_id}")
         
     async def handle_status_request(self, message: A2AMessage):
         """Handle a status request"""
@@ -271,7 +536,7 @@ class MultimediaAgent:
         
     async def handle_cancel_request(self, message: A2AMessage):
         """Handle a job cancellation request"""
-        job_id = message.payload.data.get("job_id")
+        job_id = message.payload.get("job_id")
         
         if job_id in self.current_jobs:
             self.current_jobs[job_id]["status"] = "cancelled"
@@ -288,15 +553,14 @@ class MultimediaAgent:
         
     async def handle_acknowledgment(self, message: A2AMessage):
         """Handle acknowledgment messages"""
-        ack_for = message.payload.data.get("ack_for")
-        if ack_for in self.protocol.pending_acks:
-            del self.protocol.pending_acks[ack_for]
+        ack_for = message.payload.get("ack_for")
+        if self.protocol.acknowledge(ack_for):
             print(f"[{self.agent_id}] Received ACK for message: {ack_for}")
             
     async def handle_error(self, message: A2AMessage):
         """Handle error messages"""
-        error = message.payload.data.get("error")
-        original_id = message.payload.data.get("original_message_id")
+        error = message.payload.get("error")
+        original_id = message.payload.get("original_message_id")
         print(f"[{self.agent_id}] Received error for message {original_id}: {error}")
         
     async def simulate_processing(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -397,7 +661,15 @@ async def demonstrate_a2a_protocol():
         )
         
         await orchestrator.protocol.send_message(process_request)
-        await agent.protocol.receive_message(process_request)
+        response = await agent.protocol.receive_message(process_request)
+        if response:
+            await orchestrator.protocol.receive_message(response)
+            # Deliver the orchestrator's ACK so the agent can release the results
+            ack = next(
+                m for m in reversed(orchestrator.protocol.message_history)
+                if m.payload.action == "ack" and m.header.correlation_id == response.header.message_id
+            )
+            await agent.protocol.receive_message(ack)
     
     # Print protocol statistics
     print(f"\n📊 A2A Protocol Statistics:")
@@ -407,6 +679,7 @@ async def demonstrate_a2a_protocol():
         print(f"    Messages: {stats['total_messages']}")
         print(f"    Handlers: {stats['registered_handlers']}")
         print(f"    Pending ACKs: {stats['pending_acks']}")
+        print(f"    Stored blobs: {stats['stored_blobs']}")
 
 if __name__ == "__main__":
     asyncio.run(demonstrate_a2a_protocol())
@@ -57,10 +57,17 @@ class AgentOrchestrator:
         print(f"A2A Message: {message.from_agent} -> {message.to_agent}")
         print(f"Type: {message.message_type.value}")
         print(f"Payload: {json.dumps(message.payload, indent=2)}")
+        if "results_ref" in message.payload:
+            results = self.resolve_results(message.payload["results_ref"])
+            print(f"Results: {json.dumps(results)}")
         
         # Simulate message processing
         await asyncio.sleep(0.1)
         
+    def resolve_results(self, results_ref: Dict[str, str]) -> Dict[str, Any]:
+        """Look up the results a message refers to"""
+        return self.jobs[results_ref["job_id"]]["results"][results_ref["agent_id"]]
+        
     async def process_file(self, file_path: str, file_type: str):
         """Process a file through the agent pipeline"""
         job_id = str(uuid.uuid4())
@@ -121,7 +128,9 @@ class AgentOrchestrator:
                     payload={
                         "action": "process_complete",
                         "job_id": job_id,
-                        "results": results
+                        # Results already live in self.jobs; reference them
+                        # instead of copying them into every message
+                        "results_ref": {"job_id": job_id, "agent_id": agent_id}
                     }
                 )
                 
@@ -0,0 +1,181 @@
+"""
+Checks for the A2A blob store and by-reference payloads
+Run with: python -m pytest scripts/test_a2a_protocol.py (or python scripts/test_a2a_protocol.py)
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from dataclasses import asdict
+
+from a2a_protocol import (
+    A2AMessage,
+    A2AProtocol,
+    BlobRef,
+    BlobStore,
+    MultimediaAgent,
+    default_blob_store,
+)
+
+def test_custom_store_is_kept_even_when_empty():
+    store = BlobStore()
+    protocol = A2AProtocol("a", blob_store=store)
+    assert protocol.blob_store is store
+
+    message = protocol.create_message("b", "process", {"job_id": "1"}, blobs={"results": {"k": 1}})
+    ref = message.payload.data["results"]
+    assert ref.store is store
+    assert ref.blob_id in store
+    assert ref.blob_id not in default_blob_store
+
+def test_objects_are_passed_without_copying():
+    store = BlobStore()
+    results = {"frames": list(range(1000))}
+    ref = store.put(results)
+    assert ref.value() is results
+    assert not ref.is_binary
+
+def test_handle_round_trip():
+    store = BlobStore()
+    protocol = A2AProtocol("a", blob_store=store)
+    message = protocol.create_message(
+        "b", "process", {"job_id": "1"},
+        blobs={"results": {"scenes": 12}, "thumbnail": b"\x89PNG"}
+    )
+
+    encoded = json.dumps(message.to_dict(), default=lambda o: o.value)
+    decoded = A2AMessage.from_dict(json.loads(encoded), blob_store=store)
+
+    assert isinstance(decoded.payload.data["results"], BlobRef)
+    assert decoded.payload.get("results") == {"scenes": 12}
+    assert bytes(decoded.payload.get("thumbnail")) == b"\x89PNG"
+    assert decoded.payload.get("job_id") == "1"
+
+    object_only = protocol.create_message("b", "process", {}, blobs={"results": {"scenes": 12}})
+    inlined = object_only.to_dict(inline_blobs=True)["payload"]["data"]
+    assert inlined["results"] == {"scenes": 12}
+
+def test_inline_refuses_in_memory_binary():
+    protocol = A2AProtocol("a", blob_store=BlobStore())
+    message = protocol.create_message("b", "process", {}, blobs={"thumbnail": b"\x89PNG"})
+    try:
+        message.to_dict(inline_blobs=True)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("in-memory binary blob was sent out of process")
+
+def test_file_handle_resolves_in_another_store():
+    sender_store = BlobStore()
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(b"frame data")
+    try:
+        protocol = A2AProtocol("a", blob_store=sender_store)
+        message = protocol.create_message("b", "process", {}, blobs={"frames": sender_store.put_file(f.name)})
+        encoded = json.dumps(message.to_dict(inline_blobs=True), default=lambda o: o.value)
+
+        receiver_store = BlobStore()
+        decoded = A2AMessage.from_dict(json.loads(encoded), blob_store=receiver_store)
+        view = decoded.payload.get("frames")
+        assert bytes(view) == b"frame data"
+        view.release()
+        receiver_store.release(decoded.payload.data["frames"].blob_id)
+        sender_store.release(message.payload.data["frames"].blob_id)
+    finally:
+        os.unlink(f.name)
+
+def test_user_dict_with_blob_key_is_not_a_handle():
+    data = {"header": A2AProtocol("a").create_message("b", "process", {}).to_dict()["header"],
+            "payload": {"action": "process", "data": {"q": {"$blob": "lit"}}}}
+    data["header"]["priority"] = 2
+    decoded = A2AMessage.from_dict(data)
+    assert decoded.payload.get("q") == {"$blob": "lit"}
+
+def test_asdict_does_not_copy_the_store():
+    protocol = A2AProtocol("a", blob_store=BlobStore())
+    message = protocol.create_message("b", "process", {}, blobs={"thumbnail": b"abc"})
+    ref = message.payload.data["thumbnail"]
+    assert asdict(message)["payload"]["data"]["thumbnail"] is ref
+
+def test_bytearray_is_detached_from_caller():
+    store = BlobStore()
+    data = bytearray(b"abc")
+    ref = store.put(data)
+    data.extend(b"def")
+    assert bytes(ref.value()) == b"abc"
+
+def test_release_keeps_handed_out_views_valid():
+    store = BlobStore()
+    ref = store.put(b"payload")
+    view = ref.value()
+    ref.release()
+    assert ref.blob_id not in store
+    assert bytes(view) == b"payload"
+    ref.release()
+
+def test_mmap_file_and_release_with_live_slice():
+    store = BlobStore()
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(b"frame data")
+    try:
+        ref = store.put_file(f.name)
+        assert ref.size == len(b"frame data")
+        view = ref.value()
+        store.release(ref.blob_id)
+        assert ref.blob_id not in store
+        assert bytes(view[:5]) == b"frame"
+        view.release()
+    finally:
+        os.unlink(f.name)
+
+def test_mmap_empty_file():
+    store = BlobStore()
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        pass
+    try:
+        ref = store.put_file(f.name)
+        assert ref.size == 0
+        assert bytes(ref.value()) == b""
+        ref.release()
+    finally:
+        os.unlink(f.name)
+
+def test_sender_releases_blobs_when_acked():
+    store = BlobStore()
+    orchestrator = MultimediaAgent("orchestrator", "orchestrator", [], blob_store=store)
+    agent = MultimediaAgent("metadata-agent", "metadata", [], blob_store=store)
+
+    async def run():
+        request = orchestrator.protocol.create_message("metadata-agent", "process", {"job_id": "1"})
+        response = await agent.protocol.receive_message(request)
+        assert response.header.requires_ack
+        assert response.header.message_id in agent.protocol.pending_acks
+
+        await orchestrator.protocol.receive_message(response)
+        # Still owned by the sender: readable from history and redeliverable
+        assert len(store) == 1
+        assert agent.protocol.message_history[-1].payload.get("results")["objects_detected"] == 15
+        await orchestrator.protocol.receive_message(response)
+
+        ack = orchestrator.protocol.message_history[-1]
+        assert ack.payload.action == "ack"
+        await agent.protocol.receive_message(ack)
+
+    asyncio.run(run())
+    assert len(store) == 0
+    assert not agent.protocol.pending_acks
+    assert orchestrator.received_results["1"]["metadata-agent"]["objects_detected"] == 15
+    assert "results" not in agent.current_jobs["1"]
+
+def test_process_complete_without_results():
+    orchestrator = MultimediaAgent("orchestrator", "orchestrator", [], blob_store=BlobStore())
+    message = orchestrator.protocol.create_message("orchestrator", "process_complete", {"job_id": "1"})
+    asyncio.run(orchestrator.protocol.receive_message(message))
+    assert orchestrator.received_results["1"]["orchestrator"] == {}
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")